@@ -1,4 +1,6 @@
+import asyncio
 import re
+import threading
 from abc import ABC, abstractmethod
 from contextvars import ContextVar
 from typing import (
@@ -13,6 +15,7 @@ from typing import (
 )
 from uuid import uuid4
 
+from langchain_core.caches import BaseCache
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.load import dumps
 from langchain_core.runnables import (
@@ -27,7 +30,17 @@ from ursa.observability.timing import (
 )
 
 InputLike = Union[str, Mapping[str, Any]]
+# checkpoint_mode -> LangGraph durability (None keeps its per-step default)
+_CHECKPOINT_DURABILITY = {"node": None, "end_of_workflow": "exit"}
+# configurable key LangGraph reads durability from
+# (langgraph._internal._constants.CONFIG_KEY_DURABILITY)
+_CONFIG_KEY_DURABILITY = "__pregel_durability"
 _INVOKE_DEPTH = ContextVar("_INVOKE_DEPTH", default=0)
+# id(agent) -> Telemetry of the top-level run executing in this context; set
+# only for runs that overlap another run on the same agent instance
+_RUN_TELEMETRY: ContextVar[Optional[Mapping[int, Telemetry]]] = ContextVar(
+    "_RUN_TELEMETRY", default=None
+)
 
 
 def _to_snake(s: str) -> str:
@@ -53,6 +66,8 @@ class BaseAgent(ABC):
         metrics_dir: str = ".ursa_metrics",  # dir to save metrics, with a default
         autosave_metrics: bool = True,
         thread_id: Optional[str] = None,
+        llm_cache: Optional[BaseCache] = None,  # e.g. util.llm_cache
+        checkpoint_mode: str = "node",  # "node" | "end_of_workflow"
         **kwargs,
     ):
         match llm:
@@ -73,13 +88,65 @@ class BaseAgent(ABC):
                     "llm argument must be a string with the provider and model, or a BaseChatModel instance."
                 )
 
+        if llm_cache is not None:
+            # copy, so other agents sharing the caller's model stay uncached
+            self.llm = self.llm.model_copy(update={"cache": llm_cache})
+
         self.thread_id = thread_id or uuid4().hex
+        if checkpoint_mode not in _CHECKPOINT_DURABILITY:
+            raise ValueError(
+                f"checkpoint_mode must be 'node' or 'end_of_workflow', got {checkpoint_mode!r}."
+            )
+        # "end_of_workflow": LangGraph keeps step checkpoints in memory and
+        # saves once when the graph exits (durability="exit")
+        self._durability = _CHECKPOINT_DURABILITY[checkpoint_mode]
         self.checkpointer = checkpointer
-        self.telemetry = Telemetry(
+        self._telemetry = Telemetry(
             enable=enable_metrics,
             output_dir=metrics_dir,
             save_json_default=autosave_metrics,
         )
+        self._active_runs = 0
+        self._runs_lock = threading.Lock()
+
+    @property
+    def telemetry(self) -> Telemetry:
+        """
+        Telemetry of the current run.
+
+        Top-level runs that overlap on one instance (concurrent ``ainvoke``
+        calls, or ``invoke`` from several threads) each record into their own
+        Telemetry, so their metrics and run ids don't mix.
+        """
+        return (_RUN_TELEMETRY.get() or {}).get(id(self)) or self._telemetry
+
+    @telemetry.setter
+    def telemetry(self, value: Telemetry) -> None:
+        self._telemetry = value
+
+    def _begin_top_level_run(self) -> Optional[Mapping[int, Telemetry]]:
+        """Start telemetry for a depth-0 call; returns the state to restore."""
+        with self._runs_lock:
+            overlapping = self._active_runs > 0
+            self._active_runs += 1
+        prev = _RUN_TELEMETRY.get()
+        telemetry = self._telemetry
+        if overlapping:
+            telemetry = telemetry.fork()
+            _RUN_TELEMETRY.set({**(prev or {}), id(self): telemetry})
+        telemetry.begin_run(agent=self.name, thread_id=self.thread_id)
+        return prev
+
+    def _end_top_level_run(
+        self, prev: Optional[Mapping[int, Telemetry]], **render_kwargs: Any
+    ) -> None:
+        try:
+            self.telemetry.render(**render_kwargs)
+        finally:
+            # set() rather than reset(): stream() may be closed elsewhere
+            _RUN_TELEMETRY.set(prev)
+            with self._runs_lock:
+                self._active_runs -= 1
 
     @property
     def name(self) -> str:
@@ -136,6 +203,8 @@ class BaseAgent(ABC):
             "tags": [self.name],
             "callbacks": self.telemetry.callbacks,
         }
+        if self._durability is not None:
+            base["configurable"][_CONFIG_KEY_DURABILITY] = self._durability
         # include model name when we can
         model_name = getattr(self, "llm_model", None) or getattr(
             getattr(self, "llm", None), "model", None
@@ -149,10 +218,11 @@ class BaseAgent(ABC):
             base["configurable"].update(overrides.pop("configurable"))
         if "metadata" in overrides and isinstance(overrides["metadata"], dict):
             base["metadata"].update(overrides.pop("metadata"))
-        # merge tags if caller provides them
+        # merge tags if caller provides them (set lookup, not a list scan)
         if "tags" in overrides and isinstance(overrides["tags"], list):
+            existing = set(base["tags"])
             base["tags"] = base["tags"] + [
-                t for t in overrides.pop("tags") if t not in base["tags"]
+                t for t in overrides.pop("tags") if t not in existing
             ]
         base.update(overrides)
         return base
@@ -176,6 +246,33 @@ class BaseAgent(ABC):
     }
     _CONTROL_KW = {"config", "recursion_limit", "tags", "metadata", "callbacks"}
 
+    def _split_invoke_kwargs(
+        self, inputs: Optional[InputLike], kwargs: dict[str, Any]
+    ) -> tuple[InputLike, dict[str, Any]]:
+        """Separate keyword-inputs from control kwargs for invoke/ainvoke."""
+        # If no positional inputs were provided, split kwargs into inputs vs control
+        if inputs is None:
+            kw_inputs: dict[str, Any] = {}
+            control_kwargs: dict[str, Any] = {}
+            for k, v in kwargs.items():
+                if k in self._TELEMETRY_KW or k in self._CONTROL_KW:
+                    control_kwargs[k] = v
+                else:
+                    kw_inputs[k] = v
+            # keyword inputs become the inputs; only control kwargs remain
+            return kw_inputs, control_kwargs
+
+        # If both positional inputs and extra unknown kwargs-as-inputs are given, forbid merging
+        # keep only control kwargs; anything else would be ambiguous
+        for k in kwargs.keys():
+            if not (k in self._TELEMETRY_KW or k in self._CONTROL_KW):
+                raise TypeError(
+                    f"Unexpected keyword argument '{k}'. "
+                    "Pass inputs as a single mapping or omit the positional "
+                    "inputs and pass them as keyword arguments."
+                )
+        return inputs, kwargs
+
     @final
     def invoke(
         self,
@@ -191,35 +288,10 @@ class BaseAgent(ABC):
         **kwargs: Any,  # may contain inputs (keyword-inputs) and/or control kw
     ) -> Any:
         depth = _INVOKE_DEPTH.get()
+        run_state = self._begin_top_level_run() if depth == 0 else None
         _INVOKE_DEPTH.set(depth + 1)
         try:
-            if depth == 0:
-                self.telemetry.begin_run(
-                    agent=self.name, thread_id=self.thread_id
-                )
-
-            # If no positional inputs were provided, split kwargs into inputs vs control
-            if inputs is None:
-                kw_inputs: dict[str, Any] = {}
-                control_kwargs: dict[str, Any] = {}
-                for k, v in kwargs.items():
-                    if k in self._TELEMETRY_KW or k in self._CONTROL_KW:
-                        control_kwargs[k] = v
-                    else:
-                        kw_inputs[k] = v
-                inputs = kw_inputs
-                kwargs = control_kwargs  # only control kwargs remain
-
-            # If both positional inputs and extra unknown kwargs-as-inputs are given, forbid merging
-            else:
-                # keep only control kwargs; anything else would be ambiguous
-                for k in kwargs.keys():
-                    if not (k in self._TELEMETRY_KW or k in self._CONTROL_KW):
-                        raise TypeError(
-                            f"Unexpected keyword argument '{k}'. "
-                            "Pass inputs as a single mapping or omit the positional "
-                            "inputs and pass them as keyword arguments."
-                        )
+            inputs, kwargs = self._split_invoke_kwargs(inputs, kwargs)
 
             # subclasses may translate keys
             normalized = self._normalize_inputs(inputs)
@@ -231,7 +303,44 @@ class BaseAgent(ABC):
             new_depth = _INVOKE_DEPTH.get() - 1
             _INVOKE_DEPTH.set(new_depth)
             if new_depth == 0:
-                self.telemetry.render(
+                self._end_top_level_run(
+                    run_state,
+                    raw=raw_debug,
+                    save_json=save_json,
+                    filepath=metrics_path,
+                    save_raw_snapshot=save_raw_snapshot,
+                    save_raw_records=save_raw_records,
+                )
+
+    @final
+    async def ainvoke(
+        self,
+        inputs: Optional[InputLike] = None,  # sentinel
+        /,
+        *,
+        raw_debug: bool = False,
+        save_json: Optional[bool] = None,
+        metrics_path: Optional[str] = None,
+        save_raw_snapshot: Optional[bool] = None,
+        save_raw_records: Optional[bool] = None,
+        config: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Async counterpart of invoke(). Telemetry-wrapped."""
+        depth = _INVOKE_DEPTH.get()
+        run_state = self._begin_top_level_run() if depth == 0 else None
+        _INVOKE_DEPTH.set(depth + 1)
+        try:
+            inputs, kwargs = self._split_invoke_kwargs(inputs, kwargs)
+            normalized = self._normalize_inputs(inputs)
+            return await self._ainvoke(normalized, config=config, **kwargs)
+
+        finally:
+            new_depth = _INVOKE_DEPTH.get() - 1
+            _INVOKE_DEPTH.set(new_depth)
+            if new_depth == 0:
+                self._end_top_level_run(
+                    run_state,
                     raw=raw_debug,
                     save_json=save_json,
                     filepath=metrics_path,
@@ -254,16 +363,28 @@ class BaseAgent(ABC):
         """Subclasses implement the actual work against normalized inputs."""
         ...
 
+    async def _ainvoke(self, inputs: Mapping[str, Any], **config: Any) -> Any:
+        """
+        Async work against normalized inputs. By default this runs _invoke()
+        in a worker thread so several agents can be awaited concurrently;
+        override it to await the compiled graph's ainvoke() directly.
+        """
+        return await asyncio.to_thread(self._invoke, inputs, **config)
+
     def __call__(self, inputs: InputLike, /, **kwargs: Any) -> Any:
         return self.invoke(inputs, **kwargs)
 
-    # Runtime enforcement: forbid subclasses from overriding invoke
+    # Runtime enforcement: forbid subclasses from overriding invoke/ainvoke
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         if "invoke" in cls.__dict__:
             raise TypeError(
                 f"{cls.__name__} must not override BaseAgent.invoke(); implement _invoke() only."
             )
+        if "ainvoke" in cls.__dict__:
+            raise TypeError(
+                f"{cls.__name__} must not override BaseAgent.ainvoke(); implement _ainvoke() only."
+            )
 
     def stream(
         self,
@@ -280,19 +401,17 @@ class BaseAgent(ABC):
     ) -> Iterator[Any]:
         """Public streaming entry point. Telemetry-wrapped."""
         depth = _INVOKE_DEPTH.get()
+        run_state = self._begin_top_level_run() if depth == 0 else None
         _INVOKE_DEPTH.set(depth + 1)
         try:
-            if depth == 0:
-                self.telemetry.begin_run(
-                    agent=self.name, thread_id=self.thread_id
-                )
             normalized = self._normalize_inputs(inputs)
             yield from self._stream(normalized, config=config, **kwargs)
         finally:
             new_depth = _INVOKE_DEPTH.get() - 1
             _INVOKE_DEPTH.set(new_depth)
             if new_depth == 0:
-                self.telemetry.render(
+                self._end_top_level_run(
+                    run_state,
                     raw=raw_debug,
                     save_json=save_json,
                     filepath=metrics_path,
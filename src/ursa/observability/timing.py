@@ -3,15 +3,19 @@ from __future__ import annotations
 
 import collections
 import datetime
+import functools
 import importlib
+import inspect
+import itertools
 import json
 import os
 import re
+import secrets
 import time
-import uuid
 from collections import defaultdict
 from dataclasses import dataclass, field
 from functools import wraps
+from operator import itemgetter
 from threading import Lock
 from typing import Any, Callable, Dict, Iterable, List, Tuple
 
@@ -52,10 +56,46 @@ def _to_snake(s: str) -> str:
     return s.lower()
 
 
+@functools.lru_cache(maxsize=1024)
+def _node_label(ns: str, node_base: str) -> str:
+    """'node:<snake ns>:<node>' for a namespaced graph node span (memoized)."""
+    # canonicalize "graph:step:N:<node>" → "<node>"
+    if node_base.startswith("graph:step:"):
+        # split on last colon so "graph:step:N:<node>" → "<node>"
+        parts = node_base.split(":", 3)
+        if len(parts) == 4:
+            node_base = parts[3]
+    # namespace + snake casing for safety
+    return f"node:{_to_snake(ns)}:{node_base}"
+
+
+# Run ids are "<process nonce>-<counter>": unique across processes without
+# an os.urandom call per run. The nonce is re-drawn in forked children.
+_RUN_NONCE = secrets.token_hex(4)
+_RUN_COUNTER = itertools.count(1)
+
+
+def _reset_run_ids() -> None:
+    global _RUN_NONCE, _RUN_COUNTER
+    _RUN_NONCE = secrets.token_hex(4)
+    _RUN_COUNTER = itertools.count(1)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_run_ids)
+
+
+def _next_run_id() -> str:
+    return f"{_RUN_NONCE}-{next(_RUN_COUNTER)}"
+
+
 _SESSIONS: dict[str, "SessionRollup"] = {}
 
+# (name, count, total_s, avg_ms, max_ms) rows sort by total seconds
+_BY_TOTAL = itemgetter(2)
 
-@dataclass
+
+@dataclass(slots=True)
 class _Bucket:
     count: int = 0
     total_ms: float = 0.0
@@ -76,6 +116,7 @@ class SessionRollup:
     thread_id: str
     runs: int = 0
     agents: set = field(default_factory=set)
+    run_ids: set = field(default_factory=set)  # already-ingested runs
 
     # times/costs
     wall_sum_s: float = 0.0  # sum of each run's wall time
@@ -111,6 +152,13 @@ class SessionRollup:
                 return None
 
         ctx = payload.get("context") or {}
+        # a run rendered twice (e.g. render() called again by hand) counts once
+        # (run ids are unique per process: nonce + counter)
+        run_id = ctx.get("run_id")
+        if run_id is not None:
+            if run_id in self.run_ids:
+                return
+            self.run_ids.add(run_id)
         agent = ctx.get("agent") or "agent"
         s_iso, e_iso = ctx.get("started_at"), ctx.get("ended_at")
         s_dt, e_dt = p(s_iso), p(e_iso)
@@ -136,22 +184,17 @@ class SessionRollup:
             self.runnable_by_name[row["name"]].add(
                 row["count"], row["total_s"], row["max_ms"]
             )
+        # llm/tool totals grow with this run's rows (no re-sum of all buckets)
         for row in tables.get("tool") or []:
             self.tool_by_name[row["name"]].add(
                 row["count"], row["total_s"], row["max_ms"]
             )
+            self.tool_total_s += float(row["total_s"] or 0.0)
         for row in tables.get("llm") or []:
             self.llm_by_name[row["name"]].add(
                 row["count"], row["total_s"], row["max_ms"]
             )
-
-        # recompute llm/tool totals from buckets
-        self.llm_total_s = (
-            sum(b.total_ms for b in self.llm_by_name.values()) / 1000.0
-        )
-        self.tool_total_s = (
-            sum(b.total_ms for b in self.tool_by_name.values()) / 1000.0
-        )
+            self.llm_total_s += float(row["total_s"] or 0.0)
 
         # costs (if priced)
         costs = payload.get("costs") or {}
@@ -174,7 +217,7 @@ def _rows_from_bucket_map(
     d: dict[str, _Bucket],
 ) -> list[tuple[str, int, float, float, float]]:
     rows = [b.as_row(name) for name, b in d.items()]
-    rows.sort(key=lambda r: r[2], reverse=True)  # sort by total(s)
+    rows.sort(key=_BY_TOTAL, reverse=True)  # sort by total(s)
     return rows
 
 
@@ -300,17 +343,29 @@ def render_session_summary(thread_id: str):
 #               Aggregators
 # ---------------------------
 
+# timers read perf_counter_ns (ints, no float drift) and only convert to ms
+# when a duration is stored
+_NS_PER_MS = 1_000_000
+_clock = time.perf_counter_ns  # single timing source for timers and timed_tool
+
 
 @dataclass
 class _Agg:
     # list of (name, elapsed_ms, ok)
     records: List[Tuple[str, float, bool]] = field(default_factory=list)
+    # name -> calls answered from TOOL_CACHE; kept out of the timing records
+    # so hits don't inflate counts or drag averages down
+    cache_hits: Dict[str, int] = field(default_factory=dict)
     _lock: Lock = field(default_factory=Lock, repr=False)
 
     def add(self, name: str, elapsed_ms: float, ok: bool) -> None:
         with self._lock:
             self.records.append((name, elapsed_ms, ok))
 
+    def add_hit(self, name: str) -> None:
+        with self._lock:
+            self.cache_hits[name] = self.cache_hits.get(name, 0) + 1
+
     def buckets(self) -> List[Tuple[str, int, float, float, float]]:
         # -> [(name, count, total_secs, avg_ms, max_ms)]
         by_name: Dict[str, List[float]] = defaultdict(list)
@@ -327,7 +382,7 @@ class _Agg:
                 total_ms / len(times),
                 max(times),
             ))
-        rows.sort(key=lambda r: r[2], reverse=True)  # by total seconds
+        rows.sort(key=_BY_TOTAL, reverse=True)  # by total seconds
         return rows
 
 
@@ -362,19 +417,15 @@ class PerToolTimer(BaseCallbackHandler):
 
     def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
         name = self._name(serialized)
-        self._starts[run_id] = (name, time.perf_counter())
+        self._starts[run_id] = (name, _clock())
 
     def on_tool_end(self, output, *, run_id, **kwargs):
-        name, t0 = self._starts.pop(
-            run_id, ("unknown_tool", time.perf_counter())
-        )
-        self.agg.add(name, (time.perf_counter() - t0) * 1000.0, True)
+        name, t0 = self._starts.pop(run_id, ("unknown_tool", _clock()))
+        self.agg.add(name, (_clock() - t0) / _NS_PER_MS, True)
 
     def on_tool_error(self, error, *, run_id, **kwargs):
-        name, t0 = self._starts.pop(
-            run_id, ("unknown_tool", time.perf_counter())
-        )
-        self.agg.add(name, (time.perf_counter() - t0) * 1000.0, False)
+        name, t0 = self._starts.pop(run_id, ("unknown_tool", _clock()))
+        self.agg.add(name, (_clock() - t0) / _NS_PER_MS, False)
 
 
 class PerRunnableTimer(BaseCallbackHandler):
@@ -416,15 +467,13 @@ class PerRunnableTimer(BaseCallbackHandler):
         metadata=None,
         **kwargs,
     ):
-        base_name = self._name(serialized)
-
         # Root span (keep)
         if parent_run_id is None:
-            name = base_name
+            name = self._name(serialized)
             if name == "runnable" and tags:
                 name = tags[-1]  # e.g., "graph"
             name = f"graph:{name}"
-            self._starts[run_id] = (name, time.perf_counter())
+            self._starts[run_id] = (name, _clock())
             return
 
         # ---- Child span (graph node) ----
@@ -432,47 +481,32 @@ class PerRunnableTimer(BaseCallbackHandler):
 
         # Only keep spans that our wrapper marked with a namespace.
         # This filters out internal 'graph:step:N:<node>' duplicates.
+        # Checked before resolving any names: most child spans stop here.
         ns = md.get("ursa_ns")
         if not ns:
             return  # ignore un-namespaced child spans
 
         # node base name (prefer explicit metadata)
+        get = md.get
         node_base = (
-            md.get("langgraph_node")
-            or md.get("node_name")
-            or md.get("langgraph:node")
-            or base_name
+            get("langgraph_node")
+            or get("node_name")
+            or get("langgraph:node")
+            or self._name(serialized)
         )
 
-        # canonicalize "graph:step:N:<node>" → "<node>"
-        if isinstance(node_base, str) and node_base.startswith("graph:step:"):
-            # split on last colon so "graph:step:N:<node>" → "<node>"
-            parts = node_base.split(":", 3)
-            if len(parts) == 4:
-                node_base = parts[3]
-
-        # namespace + snake casing for safety
-        def _to_snake(s: str) -> str:
-            import re
-
-            s = str(s)
-            s = re.sub(r"(?<!^)(?=[A-Z])", "_", s)
-            s = s.replace("-", "_").replace(" ", "_")
-            return s.lower()
-
-        ns = _to_snake(ns)
-        qualified = f"{ns}:{node_base}"
-        name = f"node:{qualified}"
-
-        self._starts[run_id] = (name, time.perf_counter())
+        self._starts[run_id] = (
+            _node_label(str(ns), str(node_base)),
+            _clock(),
+        )
 
     def on_chain_end(self, outputs, *, run_id, **kwargs):
-        name, t0 = self._starts.pop(run_id, ("runnable", time.perf_counter()))
-        self.agg.add(name, (time.perf_counter() - t0) * 1000.0, True)
+        name, t0 = self._starts.pop(run_id, ("runnable", _clock()))
+        self.agg.add(name, (_clock() - t0) / _NS_PER_MS, True)
 
     def on_chain_error(self, error, *, run_id, **kwargs):
-        name, t0 = self._starts.pop(run_id, ("runnable", time.perf_counter()))
-        self.agg.add(name, (time.perf_counter() - t0) * 1000.0, False)
+        name, t0 = self._starts.pop(run_id, ("runnable", _clock()))
+        self.agg.add(name, (_clock() - t0) / _NS_PER_MS, False)
 
 
 def _to_int(x, default=0):
@@ -528,6 +562,26 @@ def _acc_from(d: dict, roll: dict):
                 pass
 
 
+def _extract_extras(d: dict) -> dict:
+    if not isinstance(d, dict):
+        return {"reasoning_tokens": 0, "cached_tokens": 0}
+    # reasoning
+    rt = d.get("reasoning_tokens") or (
+        d.get("completion_tokens_details") or {}
+    ).get("reasoning_tokens")
+    # cached
+    cached = (
+        d.get("cached_tokens")
+        or d.get("cached_input_tokens")
+        or (d.get("prompt_tokens_details") or {}).get("cached_tokens")
+        or d.get("prompt_cache_hits")
+    )
+    return {
+        "reasoning_tokens": _to_int(rt),
+        "cached_tokens": _to_int(cached),
+    }
+
+
 def _maybe_add_extras(d: dict, roll: dict):
     if not isinstance(d, dict):
         return
@@ -581,7 +635,7 @@ class PerLLMTimer(BaseCallbackHandler):
         name = self._name(serialized, metadata, tags)
         self._starts[run_id] = (
             name,
-            time.perf_counter(),
+            _clock(),
             tags or [],
             metadata or {},
         )
@@ -645,6 +699,9 @@ class PerLLMTimer(BaseCallbackHandler):
 
             if resp_meta_list:
                 out["response_metadata"] = resp_meta_list
+                # served from an LLM cache (see ursa.util.llm_cache)
+                if any(rm.get("cache_hit") for rm in resp_meta_list):
+                    out["cache_hit"] = True
             if usage_meta_list:
                 out["usage_metadata"] = usage_meta_list
 
@@ -664,34 +721,6 @@ class PerLLMTimer(BaseCallbackHandler):
                     _acc_from(coerced, roll)
                     out["usage_source"] = "llm_output.token_usage"
 
-            def _extract_extras(d: dict) -> dict:
-                if not isinstance(d, dict):
-                    return {"reasoning_tokens": 0, "cached_tokens": 0}
-                # reasoning
-                rt = d.get("reasoning_tokens") or (
-                    d.get("completion_tokens_details") or {}
-                ).get("reasoning_tokens")
-                # cached
-                cached = (
-                    d.get("cached_tokens")
-                    or d.get("cached_input_tokens")
-                    or (d.get("prompt_tokens_details") or {}).get(
-                        "cached_tokens"
-                    )
-                    or d.get("prompt_cache_hits")
-                )
-
-                def _to_int(x):
-                    try:
-                        return int(float(x))
-                    except Exception:
-                        return 0
-
-                return {
-                    "reasoning_tokens": _to_int(rt),
-                    "cached_tokens": _to_int(cached),
-                }
-
             # Enrich from non-selected sources only (avoid double-counting the same info)
             src = out.get("usage_source")
             extras_candidates = []
@@ -734,9 +763,9 @@ class PerLLMTimer(BaseCallbackHandler):
 
     def on_llm_end(self, response, *, run_id, **kwargs):
         name, t0, tags, metadata = self._starts.pop(
-            run_id, ("llm:unknown", time.perf_counter(), [], {})
+            run_id, ("llm:unknown", _clock(), [], {})
         )
-        ms = (time.perf_counter() - t0) * 1000.0
+        ms = (_clock() - t0) / _NS_PER_MS
         self.agg.add(name, ms, True)
         metrics = self._extract_metrics(response)
         self.samples.append({
@@ -750,9 +779,9 @@ class PerLLMTimer(BaseCallbackHandler):
 
     def on_llm_error(self, error, *, run_id, **kwargs):
         name, t0, tags, metadata = self._starts.pop(
-            run_id, ("llm:unknown", time.perf_counter(), [], {})
+            run_id, ("llm:unknown", _clock(), [], {})
         )
-        ms = (time.perf_counter() - t0) * 1000.0
+        ms = (_clock() - t0) / _NS_PER_MS
         self.agg.add(name, ms, False)
         self.samples.append({
             "name": name,
@@ -859,26 +888,164 @@ def _coerce_usage(obj) -> dict:
 # ---------------------------------
 
 
+# Process-wide switch for timed_tool; BaseAgent(enable_metrics=...) keeps its
+# own per-instance flag on Telemetry.enable.
+METRICS_ENABLED = True
+
+# (fn, frozen args, frozen kwargs) -> (stored_at, result), LRU ordered
+TOOL_CACHE: "collections.OrderedDict[tuple, Tuple[float, Any]]" = (
+    collections.OrderedDict()
+)
+TOOL_CACHE_MAX = 1024
+_TOOL_CACHE_LOCK = Lock()
+
+
+def _freeze(obj):
+    """
+    Turn an argument into a hashable cache key.
+
+    Every level is tagged with its type, so values that compare equal across
+    types (1, 1.0, True; [1] and (1,)) don't share a cache entry.
+    """
+    if isinstance(obj, dict):
+        return (
+            type(obj),
+            frozenset((_freeze(k), _freeze(v)) for k, v in obj.items()),
+        )
+    if isinstance(obj, (list, tuple)):
+        return (type(obj), tuple(_freeze(v) for v in obj))
+    if isinstance(obj, (set, frozenset)):
+        return (type(obj), frozenset(_freeze(v) for v in obj))
+    hash(obj)  # raises TypeError for anything we can't key on
+    return (type(obj), obj)
+
+
+_MISS = object()
+
+
+def _tool_cache_get(key: tuple, ttl: float | None) -> Any:
+    with _TOOL_CACHE_LOCK:
+        hit = TOOL_CACHE.get(key)
+        if hit is None or (
+            ttl is not None and time.monotonic() - hit[0] >= ttl
+        ):
+            return _MISS
+        TOOL_CACHE.move_to_end(key)
+        return hit[1]
+
+
+def _tool_cache_put(key: tuple, result: Any) -> None:
+    with _TOOL_CACHE_LOCK:
+        TOOL_CACHE[key] = (time.monotonic(), result)
+        TOOL_CACHE.move_to_end(key)
+        while len(TOOL_CACHE) > TOOL_CACHE_MAX:
+            TOOL_CACHE.popitem(last=False)
+
+
 # Keep the decorator, but move it out of base.py to avoid bloat.
-def timed_tool(tool_name: str, sink: _Agg | None = None):
+def timed_tool(
+    tool_name: str,
+    sink: _Agg | None = None,
+    cacheable: bool = False,
+    ttl: float | None = None,
+):
     """
     Simple timing decorator for tools; complements PerToolTimer callbacks.
     If you're already using the callback, this adds a local measurement too.
+
+    Pass cacheable=True (only for pure tools) to memoize results in
+    TOOL_CACHE by (fn, args, kwargs); repeated calls then return the stored
+    result and are counted in sink.cache_hits instead of the timings. ttl
+    (seconds) expires entries; calls with unhashable arguments always run.
+
+    With METRICS_ENABLED off, uncacheable tools are returned undecorated and
+    the wrappers skip the clock and sink entirely.
     """
     sink = sink or _Agg()
+    # bound once per decorated tool, not looked up on every call
+    add = sink.add
+    add_hit = sink.add_hit
 
     def deco(fn: Callable):
+        if not (METRICS_ENABLED or cacheable):
+            return fn  # nothing to time or memoize
+
+        def _key(args, kwargs):
+            if not cacheable:
+                return None
+            try:
+                return (fn, _freeze(args), _freeze(kwargs))
+            except TypeError:
+                return None  # unhashable args: just run the tool
+
+        # pick the wrapper once, here, rather than inspecting results per call
+        if inspect.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                key = _key(args, kwargs)
+                if key is not None:
+                    hit = _tool_cache_get(key, ttl)
+                    if hit is not _MISS:
+                        if METRICS_ENABLED:
+                            add_hit(tool_name)
+                        return hit
+
+                if not METRICS_ENABLED:
+                    result = await fn(*args, **kwargs)
+                    if key is not None:
+                        _tool_cache_put(key, result)
+                    return result
+
+                t0 = _clock()
+                ok = True
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception:
+                    ok = False
+                    raise
+                finally:
+                    add(
+                        tool_name,
+                        (_clock() - t0) / _NS_PER_MS,
+                        ok,
+                    )
+
+                if key is not None:
+                    _tool_cache_put(key, result)
+                return result
+
+            return async_wrapper
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            t0 = time.perf_counter()
+            key = _key(args, kwargs)
+            if key is not None:
+                hit = _tool_cache_get(key, ttl)
+                if hit is not _MISS:
+                    if METRICS_ENABLED:
+                        add_hit(tool_name)
+                    return hit
+
+            if not METRICS_ENABLED:
+                result = fn(*args, **kwargs)
+                if key is not None:
+                    _tool_cache_put(key, result)
+                return result
+
+            t0 = _clock()
             ok = True
             try:
-                return fn(*args, **kwargs)
+                result = fn(*args, **kwargs)
             except Exception:
                 ok = False
                 raise
             finally:
-                sink.add(tool_name, (time.perf_counter() - t0) * 1000.0, ok)
+                add(tool_name, (_clock() - t0) / _NS_PER_MS, ok)
+
+            if key is not None:
+                _tool_cache_put(key, result)
+            return result
 
         return wrapper
 
@@ -925,14 +1092,15 @@ def render_table(
     return "\n".join(out)
 
 
-def _parse_iso(ts: str | None):
-    if not ts:
-        return None
-    # handle both "...Z" and "+00:00"
-    try:
-        return datetime.datetime.fromisoformat(ts.replace("Z", "+00:00"))
-    except Exception:
-        return None
+def _iso_from_ns(ns: int) -> str:
+    """UTC ISO-8601 timestamp (microsecond precision) for an epoch-ns value."""
+    secs, rem_ns = divmod(ns, 1_000_000_000)
+    return (
+        datetime.datetime
+        .fromtimestamp(secs, tz=datetime.timezone.utc)
+        .replace(microsecond=rem_ns // 1000)
+        .isoformat()
+    )
 
 
 def _mk_table(
@@ -1068,27 +1236,56 @@ class Telemetry:
     # Run-scoped context we’ll embed in the JSON filename/body
     context: Dict[str, Any] = field(default_factory=dict)
 
+    # wall-clock bounds of the run (epoch ns); ISO strings only built for JSON
+    _started_ns: int | None = field(default=None, repr=False)
+    _ended_ns: int | None = field(default=None, repr=False)
+
     # ---------- JSON/export helpers ----------
     def begin_run(self, *, agent: str, thread_id: str) -> None:
         """Call at the start of BaseAgent.invoke()."""
+        # context (run_id) is set even with metrics off: build_config puts
+        # it into trace metadata for user callbacks
         self.context.clear()
         self.context.update({
             "agent": agent,
             "thread_id": thread_id,
-            "run_id": uuid.uuid4().hex,
-            "started_at": datetime.datetime.now(
-                datetime.timezone.utc
-            ).isoformat(),
+            "run_id": _next_run_id(),
         })
+        # only render() reads the wall-clock bounds, and it is a no-op when off
+        self._started_ns = time.time_ns() if self.enable else None
+        self._ended_ns = None
+
+    def fork(self) -> "Telemetry":
+        """Fresh Telemetry with the same settings, for an overlapping run."""
+        return Telemetry(
+            enable=self.enable,
+            debug_raw=self.debug_raw,
+            output_dir=self.output_dir,
+            save_json_default=self.save_json_default,
+        )
 
     @property
     def callbacks(self) -> List[BaseCallbackHandler]:
         return [] if not self.enable else [self.tool, self.runnable, self.llm]
 
-    def _snapshot(self) -> dict:
+    def _bucket_rows(self) -> dict:
+        """Bucket each aggregator once; shared by tables, snapshot and render."""
+        return {
+            "runnable": self.runnable.agg.buckets(),
+            "tool": self.tool.agg.buckets(),
+            "llm": self.llm.agg.buckets(),
+        }
+
+    def _snapshot(self, rows: dict | None = None) -> dict:
         """Collect everything we might want to inspect."""
+        rows = rows if rows is not None else self._bucket_rows()
 
         def _as_dict(obj):
+            if isinstance(obj, _Agg):
+                return {
+                    "records": list(obj.records),
+                    "cache_hits": dict(obj.cache_hits),
+                }
             try:
                 return dict(vars(obj))
             except Exception:
@@ -1107,21 +1304,17 @@ class Telemetry:
                     getattr(self.runnable, "_starts", {})
                 ),
                 "agg": _as_dict(getattr(self.runnable, "agg", {})),
-                "buckets": list(
-                    getattr(self.runnable.agg, "buckets", lambda: [])()
-                ),
+                "buckets": list(rows["runnable"]),
             },
             "tool": {
                 "_starts": _stringify_keys(getattr(self.tool, "_starts", {})),
                 "agg": _as_dict(getattr(self.tool, "agg", {})),
-                "buckets": list(
-                    getattr(self.tool.agg, "buckets", lambda: [])()
-                ),
+                "buckets": list(rows["tool"]),
             },
             "llm": {
                 "_starts": _stringify_keys(getattr(self.llm, "_starts", {})),
                 "agg": _as_dict(getattr(self.llm, "agg", {})),
-                "buckets": list(getattr(self.llm.agg, "buckets", lambda: [])()),
+                "buckets": list(rows["llm"]),
             },
         }
 
@@ -1144,8 +1337,9 @@ class Telemetry:
             "llm": _normalize(getattr(self.llm.agg, "records", [])),
         }
 
-    def _tables_struct(self) -> dict:
+    def _tables_struct(self, rows: dict | None = None) -> dict:
         """Structured tables ready for JSON."""
+        rows = rows if rows is not None else self._bucket_rows()
 
         def _rows(rows):
             # rows are (name, count, total_s, avg_ms, max_ms)
@@ -1155,9 +1349,9 @@ class Telemetry:
             ]
 
         return {
-            "runnable": _rows(self.runnable.agg.buckets()),
-            "tool": _rows(self.tool.agg.buckets()),
-            "llm": _rows(self.llm.agg.buckets()),
+            "runnable": _rows(rows["runnable"]),
+            "tool": _rows(rows["tool"]),
+            "llm": _rows(rows["llm"]),
         }
 
     def _totals(self, tables: dict) -> dict:
@@ -1181,7 +1375,7 @@ class Telemetry:
         ts = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
         agent = (self.context.get("agent") or "agent").replace(" ", "_")
         thread_id = self.context.get("thread_id") or "thread"
-        run_id = (self.context.get("run_id") or "run")[:8]
+        run_id = self.context.get("run_id") or "run"
         fname = f"{ts}_{agent}_{thread_id}_{run_id}.json"
         return os.path.join(self.output_dir, fname)
 
@@ -1213,20 +1407,33 @@ class Telemetry:
     def to_json(
         self, *, include_raw_snapshot: bool, include_raw_records: bool
     ) -> dict:
-        tables = self._tables_struct()
+        return self._build_payload(
+            self._bucket_rows(),
+            include_raw_snapshot=include_raw_snapshot,
+            include_raw_records=include_raw_records,
+        )
+
+    def _build_payload(
+        self,
+        rows: dict,
+        *,
+        include_raw_snapshot: bool,
+        include_raw_records: bool,
+    ) -> dict:
+        tables = self._tables_struct(rows)
+        self._ended_ns = time.time_ns()
+        context = dict(self.context)
+        if self._started_ns is not None:
+            context["started_at"] = _iso_from_ns(self._started_ns)
+        context["ended_at"] = _iso_from_ns(self._ended_ns)
         out = {
-            "context": {
-                **self.context,
-                "ended_at": datetime.datetime.now(
-                    datetime.timezone.utc
-                ).isoformat(),
-            },
+            "context": context,
             "tables": tables,
             "totals": self._totals(tables),
             "llm_events": list(getattr(self.llm, "samples", [])),
         }
         if include_raw_snapshot:
-            out["raw_snapshot"] = self._snapshot()
+            out["raw_snapshot"] = self._snapshot(rows)
         if include_raw_records:
             out["raw_records"] = self._records_struct()
         return out
@@ -1242,16 +1449,17 @@ class Telemetry:
         if not self.enable:
             return ""
 
-        # --- Gather tables ---
-        r_rows = self.runnable.agg.buckets()
-        t_rows = self.tool.agg.buckets()
-        l_rows = self.llm.agg.buckets() if hasattr(self, "llm") else []
+        # --- Gather tables (one bucketing pass, reused by the payload) ---
+        rows = self._bucket_rows()
+        r_rows, t_rows, l_rows = rows["runnable"], rows["tool"], rows["llm"]
 
         # --- Build priceable payload early (also gives us context) ---
         inc_snapshot = True if save_raw_snapshot is None else save_raw_snapshot
         inc_records = True if save_raw_records is None else save_raw_records
-        payload = self.to_json(
-            include_raw_snapshot=inc_snapshot, include_raw_records=inc_records
+        payload = self._build_payload(
+            rows,
+            include_raw_snapshot=inc_snapshot,
+            include_raw_records=inc_records,
         )
         ctx = payload.get("context", {}) or {}
         agent_name = (
@@ -1265,11 +1473,9 @@ class Telemetry:
         run_id = ctx.get("run_id", "—")
         started_at = ctx.get("started_at")
         ended_at = ctx.get("ended_at")
-        start_dt = _parse_iso(started_at)
-        end_dt = _parse_iso(ended_at)
         wall_secs = (
-            (end_dt - start_dt).total_seconds()
-            if (start_dt and end_dt)
+            (self._ended_ns - self._started_ns) / 1e9
+            if (self._started_ns is not None and self._ended_ns is not None)
             else None
         )
 
@@ -1343,7 +1549,7 @@ class Telemetry:
         header_lines.append(
             f"[bold magenta]{agent_label}[/] [dim]•[/] thread [bold]{thread_id}[/] [dim]•[/] run [bold]{run_id}[/]"
         )
-        if start_dt and end_dt:
+        if wall_secs is not None:
             header_lines.append(
                 f"[dim]{started_at} → {ended_at}[/dim]   [bold]wall[/]: {wall_secs:,.2f}s"
             )
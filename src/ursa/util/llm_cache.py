@@ -0,0 +1,196 @@
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.outputs import ChatGeneration
+
+
+def _canonical_prompt(prompt: str) -> str:
+    """Drop per-message ids (assigned fresh by add_messages) from a prompt."""
+    try:
+        messages = json.loads(prompt)
+    except (TypeError, ValueError):
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    for m in messages:
+        if isinstance(m, dict) and isinstance(m.get("kwargs"), dict):
+            m["kwargs"].pop("id", None)
+    return json.dumps(messages, sort_keys=True, ensure_ascii=False)
+
+
+def _prompt_text(prompt: str) -> str:
+    """Pull the message contents out of a serialized chat prompt."""
+    try:
+        messages = json.loads(prompt)
+    except (TypeError, ValueError):
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    parts = []
+    for m in messages:
+        content = (
+            (m.get("kwargs") or {}).get("content") if isinstance(m, dict) else m
+        )
+        if isinstance(content, str):
+            parts.append(content)
+        elif content is not None:
+            parts.append(json.dumps(content, sort_keys=True, default=str))
+    return "\n".join(parts) or prompt
+
+
+def _mark_hit(generation: Any) -> Any:
+    """
+    Copy a cached generation, flagging it as a hit and dropping its usage.
+
+    The message id is cleared too: LangChain then assigns a fresh one, so
+    add_messages appends the reply instead of replacing the cached original.
+    """
+    if not isinstance(generation, ChatGeneration):
+        return generation
+    msg = generation.message
+    response_metadata = {
+        k: v
+        for k, v in (msg.response_metadata or {}).items()
+        if k not in ("token_usage", "usage")
+    }
+    response_metadata["cache_hit"] = True
+    update = {"response_metadata": response_metadata, "id": None}
+    if hasattr(msg, "usage_metadata"):
+        update["usage_metadata"] = None
+    return ChatGeneration(
+        message=msg.model_copy(update=update),
+        generation_info=generation.generation_info,
+    )
+
+
+# misses kept for update(); more than the LLM calls usually in flight at once
+_MAX_PENDING_MISSES = 64
+
+
+class SemanticCache(BaseCache):
+    """
+    In-memory LLM response cache for BaseAgent.
+
+    Lookups first try an exact match on a SHA-256 of the model configuration
+    and the serialized prompt. If an ``embedding`` model is given, a miss
+    falls back to the most similar cached prompt for the same model
+    configuration, accepted when its cosine similarity reaches
+    ``threshold``.
+
+    Parameters
+    ----------
+    embedding : Embeddings | None
+        LangChain embeddings model used for the similarity fallback. With
+        *None*, only exact matches are served.
+    threshold : float
+        Minimum cosine similarity for a semantic hit.
+    max_entries : int
+        Entries kept before the least recently used one is evicted.
+
+    Notes
+    -----
+    * Hits are returned with ``response_metadata["cache_hit"] = True`` and no
+      token usage, so telemetry reports them without pricing them again.
+    * A missed prompt is embedded once: lookup() keeps the vector for the
+      update() that stores the model's answer.
+    """
+
+    def __init__(
+        self,
+        embedding=None,
+        threshold: float = 0.95,
+        max_entries: int = 1024,
+    ) -> None:
+        self.embedding = embedding
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # key -> (llm_string, normalized prompt embedding, generations)
+        self._entries: OrderedDict[
+            str, tuple[str, Optional[tuple[float, ...]], Sequence]
+        ] = OrderedDict()
+        # key -> embedding of a recent miss, waiting for its update()
+        self._miss_vecs: OrderedDict[str, Optional[tuple[float, ...]]] = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        h = hashlib.sha256()
+        h.update(llm_string.encode("utf-8"))
+        h.update(b"\0")
+        h.update(_canonical_prompt(prompt).encode("utf-8"))
+        return h.hexdigest()
+
+    def _embed(self, prompt: str) -> Optional[tuple[float, ...]]:
+        if self.embedding is None:
+            return None
+        vec = [
+            float(x) for x in self.embedding.embed_query(_prompt_text(prompt))
+        ]
+        norm = math.sqrt(sum(x * x for x in vec))
+        return tuple(x / norm for x in vec) if norm else None
+
+    def _nearest(
+        self, vec: tuple[float, ...], llm_string: str
+    ) -> Optional[str]:
+        best, best_sim = None, -math.inf
+        for k, (ls, v, _) in self._entries.items():
+            if ls != llm_string or v is None:
+                continue
+            sim = sum(a * b for a, b in zip(v, vec))  # both unit length
+            if sim > best_sim:
+                best, best_sim = k, sim
+        return best if best_sim >= self.threshold else None
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            hit = key if key in self._entries else None
+        vec = None
+        if hit is None and self.embedding is not None:
+            vec = self._embed(prompt)
+            if vec is not None:
+                with self._lock:
+                    hit = self._nearest(vec, llm_string)
+        with self._lock:
+            if hit is None or hit not in self._entries:
+                self.misses += 1
+                if self.embedding is not None:
+                    self._miss_vecs[key] = vec
+                    while len(self._miss_vecs) > _MAX_PENDING_MISSES:
+                        self._miss_vecs.popitem(last=False)
+                return None
+            self._entries.move_to_end(hit)
+            self.hits += 1
+            generations = self._entries[hit][2]
+        return [_mark_hit(g) for g in generations]
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            pending = key in self._miss_vecs
+            vec = self._miss_vecs.pop(key, None)
+        if not pending:
+            vec = self._embed(prompt)
+        with self._lock:
+            self._entries[key] = (llm_string, vec, list(return_val))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._miss_vecs.clear()
+            self.hits = 0
+            self.misses = 0
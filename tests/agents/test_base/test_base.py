@@ -1,4 +1,6 @@
+import asyncio
 import json
+import threading
 from pathlib import Path
 from typing import Annotated, Any, Mapping, TypedDict
 
@@ -8,11 +10,13 @@ from langchain_core.language_models.chat_models import BaseChatModel
 # LangChain core bits
 from langchain_core.messages import AIMessage
 from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import StateGraph
 from langgraph.graph.message import add_messages
 
 # Your project imports
 from ursa.agents.base import BaseAgent
+from ursa.util.llm_cache import SemanticCache
 
 
 # --- Tiny offline model that triggers LLM callbacks and returns usage ---
@@ -96,7 +100,7 @@ class TestAgent(BaseAgent):
         builder.set_entry_point("run_impl")
         builder.set_finish_point("run_impl")
 
-        graph = builder.compile()
+        graph = builder.compile(checkpointer=self.checkpointer)
         return graph
 
     def _invoke(
@@ -231,3 +235,236 @@ def test_metrics_toggle_off(tmp_path: Path, monkeypatch, pricing_file: Path):
     # No files should be created
     files = list(metrics_dir.glob("*.json"))
     assert files == []
+    # nothing recorded, but the run id still reaches trace metadata
+    assert agent.telemetry.context["run_id"]
+    assert (
+        agent.build_config()["metadata"]["telemetry_run_id"]
+        == agent.telemetry.context["run_id"]
+    )
+    assert agent.telemetry.runnable.agg.records == []
+
+    # nodes keep their config, so metrics can still be switched on later
+    agent.telemetry.enable = True
+    _ = agent.invoke("hello")
+    names = {name for name, _, _ in agent.telemetry.runnable.agg.records}
+    assert "node:test:run_impl" in names
+
+
+class BarrierModel(TinyCountingModel):
+    """Blocks until two calls are in flight, so overlapping runs really overlap."""
+
+    def _generate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        _TWO_CALLS.wait(timeout=10)
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+_TWO_CALLS = threading.Barrier(2)
+
+
+def test_base_agent_ainvoke(tmp_path: Path):
+    """
+    ainvoke() runs the same graph as invoke() and can be awaited concurrently;
+    overlapping runs on one agent keep separate metrics and run ids.
+    """
+    metrics_dir = tmp_path / "metrics_async"
+    agent = TestAgent(
+        llm=BarrierModel(),
+        enable_metrics=True,
+        metrics_dir=str(metrics_dir),
+    )
+
+    async def _run_two():
+        return await asyncio.gather(
+            agent.ainvoke("hello"), agent.ainvoke({"messages": ["hi"]})
+        )
+
+    outs = asyncio.run(_run_two())
+    assert len(outs) == 2
+    for out in outs:
+        assert isinstance(out, dict)
+        assert out["messages"][-1].content == "done"
+
+    payloads = [
+        json.loads(p.read_text()) for p in sorted(metrics_dir.glob("*.json"))
+    ]
+    assert len(payloads) == 2
+    run_ids = {p["context"]["run_id"] for p in payloads}
+    assert len(run_ids) == 2
+    for payload in payloads:
+        (llm_row,) = payload["tables"]["llm"]
+        assert llm_row["count"] == 1
+
+
+class CallCountingModel(TinyCountingModel):
+    calls: int = 0
+
+    def _generate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        self.calls += 1
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def test_base_agent_llm_cache(tmp_path: Path):
+    """
+    A repeated prompt is served from the llm_cache without calling the model,
+    and telemetry reports the hit without token usage.
+    """
+    metrics_dir = tmp_path / "metrics_cache"
+    cache = SemanticCache()
+    llm = CallCountingModel()
+    agent = TestAgent(
+        llm=llm,
+        enable_metrics=True,
+        autosave_metrics=True,
+        metrics_dir=str(metrics_dir),
+        llm_cache=cache,
+    )
+
+    agent.invoke("same prompt")
+    agent.invoke("same prompt")
+    assert agent.llm.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    # the caller's model is left uncached
+    assert llm.cache is None and llm.calls == 0
+
+    # hits get fresh message ids, so add_messages doesn't collapse them
+    first = agent.llm.invoke("q")
+    second = agent.llm.invoke("q")
+    assert second.response_metadata["cache_hit"] is True
+    assert first.id != second.id
+
+    # filenames start with a timestamp, so the last one is the second run
+    latest = sorted(metrics_dir.glob("*.json"))[-1]
+    ev = json.loads(latest.read_text(encoding="utf-8"))["llm_events"][-1]
+    assert ev["metrics"]["cache_hit"] is True
+    assert "usage_rollup" not in ev["metrics"]
+
+
+class CountingSaver(InMemorySaver):
+    def __init__(self):
+        super().__init__()
+        self.puts = 0
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self.puts += 1
+        return super().put(config, checkpoint, metadata, new_versions)
+
+
+@pytest.mark.parametrize("mode", ["node", "end_of_workflow"])
+def test_checkpoint_mode(tmp_path: Path, mode: str):
+    """
+    end_of_workflow saves one checkpoint per run instead of one per step; the
+    saved state, and the parent chain across runs, are the same either way.
+    """
+    saver = CountingSaver()
+    agent = TestAgent(
+        llm=TinyCountingModel(),
+        checkpointer=saver,
+        checkpoint_mode=mode,
+        metrics_dir=str(tmp_path / "metrics_ckpt"),
+    )
+
+    agent.invoke("hello")
+    if mode == "node":
+        assert saver.puts > 1
+    else:
+        assert saver.puts == 1
+
+    state = agent.graph.get_state(agent.build_config())
+    assert [m.content for m in state.values["messages"]] == ["hello", "done"]
+
+    # a second run resumes from the saved checkpoint
+    agent.invoke("again")
+    state = agent.graph.get_state(agent.build_config())
+    assert state.values["messages"][-1].content == "done"
+    assert len(state.values["messages"]) == 4
+
+    # every parent pointer resolves to a checkpoint that was actually saved
+    history = list(agent.graph.get_state_history(agent.build_config()))
+    saved = {h.config["configurable"]["checkpoint_id"] for h in history}
+    parents = [h.parent_config for h in history if h.parent_config]
+    assert parents
+    for parent in parents:
+        assert parent["configurable"]["checkpoint_id"] in saved
+
+
+def test_checkpoint_mode_config_key():
+    """end_of_workflow relies on LangGraph reading durability from config."""
+    from langgraph._internal._constants import CONFIG_KEY_DURABILITY
+
+    agent = TestAgent(
+        llm=TinyCountingModel(), checkpoint_mode="end_of_workflow"
+    )
+    assert agent.build_config()["configurable"][CONFIG_KEY_DURABILITY] == "exit"
+    with pytest.raises(ValueError):
+        TestAgent(llm=TinyCountingModel(), checkpoint_mode="batch")
+
+
+def test_write_state_round_trips(tmp_path: Path):
+    """write_state keeps LangChain messages and arbitrary-size ints."""
+    agent = TestAgent(llm=TinyCountingModel())
+    path = tmp_path / "state.json"
+    agent.write_state(
+        path, {"messages": [AIMessage(content="hi")], "big": 2**70}
+    )
+    data = json.loads(path.read_text())
+    assert data["big"] == 2**70
+    assert data["messages"][0]["kwargs"]["content"] == "hi"
+
+
+def test_build_config_merges_tags():
+    """Override tags already on the agent are skipped; the rest stay as given."""
+    agent = TestAgent(llm=TinyCountingModel())
+    cfg = agent.build_config(tags=["x", "TestAgent", "y", "x"])
+    assert cfg["tags"] == ["TestAgent", "x", "y", "x"]
+
+
+def test_session_rollup_counts_each_run_once(tmp_path: Path):
+    """Rendering the same run again doesn't add it to the session totals."""
+    from ursa.observability.timing import _SESSIONS
+
+    agent = TestAgent(
+        llm=TinyCountingModel(),
+        enable_metrics=True,
+        metrics_dir=str(tmp_path / "metrics_rollup"),
+    )
+    agent.invoke("one")
+    roll = _SESSIONS[agent.thread_id]
+    assert roll.runs == 1
+    llm_count = sum(b.count for b in roll.llm_by_name.values())
+
+    agent.telemetry.render(save_json=False)  # same run_id again
+    assert roll.runs == 1
+    assert sum(b.count for b in roll.llm_by_name.values()) == llm_count
+
+    agent.invoke("two")
+    assert roll.runs == 2
+
+
+def test_metrics_payload_records_iso_run_bounds(tmp_path: Path):
+    """Saved runs carry ISO started_at/ended_at, and the session sums them."""
+    from datetime import datetime
+
+    from ursa.observability.timing import _SESSIONS
+
+    metrics_dir = tmp_path / "metrics_bounds"
+    agent = TestAgent(
+        llm=TinyCountingModel(),
+        enable_metrics=True,
+        metrics_dir=str(metrics_dir),
+    )
+    agent.invoke("hello")
+
+    ctx = _read_single_metrics_file(metrics_dir)["context"]
+    started = datetime.fromisoformat(ctx["started_at"])
+    ended = datetime.fromisoformat(ctx["ended_at"])
+    assert started.tzinfo is not None
+    assert ended >= started
+
+    roll = _SESSIONS[agent.thread_id]
+    assert roll.started_at == ctx["started_at"]
+    assert roll.ended_at == ctx["ended_at"]
+    assert roll.wall_sum_s == pytest.approx((ended - started).total_seconds())
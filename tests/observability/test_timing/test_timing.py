@@ -0,0 +1,142 @@
+import asyncio
+import random
+
+import pytest
+
+from ursa.observability import timing
+from ursa.observability.timing import TOOL_CACHE, _Agg, timed_tool
+
+
+@pytest.fixture(autouse=True)
+def _empty_tool_cache():
+    TOOL_CACHE.clear()
+    yield
+    TOOL_CACHE.clear()
+
+
+def test_timed_tool_does_not_cache_by_default():
+    sink = _Agg()
+
+    @timed_tool("rand", sink=sink)
+    def r():
+        return random.random()
+
+    assert r() != r()
+    assert len(sink.records) == 2
+    assert sink.cache_hits == {}
+
+
+def test_timed_tool_cache_hits_recorded_separately():
+    sink = _Agg()
+    calls = []
+
+    @timed_tool("double", sink=sink, cacheable=True)
+    def double(x):
+        calls.append(x)
+        return 2 * x
+
+    assert double(3) == 6
+    assert double(3) == 6
+    assert calls == [3]
+    # only the real call is timed; the hit is counted on its own
+    assert [name for name, _, _ in sink.records] == ["double"]
+    assert sink.cache_hits == {"double": 1}
+
+
+def test_timed_tool_cache_keys_on_function():
+    @timed_tool("same_name", cacheable=True)
+    def f(x):
+        return "f"
+
+    @timed_tool("same_name", cacheable=True)
+    def g(x):
+        return "g"
+
+    assert f(1) == "f"
+    assert g(1) == "g"
+
+
+def test_timed_tool_cache_keys_on_argument_type():
+    @timed_tool("echo", cacheable=True)
+    def echo(x):
+        return type(x).__name__
+
+    assert echo(1) == "int"
+    assert echo(1.0) == "float"
+    assert echo(True) == "bool"
+    assert echo([1]) == "list"
+    assert echo((1,)) == "tuple"
+
+
+def test_timed_tool_cache_skips_unhashable_args():
+    calls = []
+
+    @timed_tool("obj", cacheable=True)
+    def tool(x):
+        calls.append(x)
+        return len(calls)
+
+    class Unhashable:
+        __hash__ = None
+
+    arg = Unhashable()
+    assert tool(arg) == 1
+    assert tool(arg) == 2
+    assert TOOL_CACHE == {}
+
+
+def test_timed_tool_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(timing, "TOOL_CACHE_MAX", 2)
+    calls = []
+
+    @timed_tool("ident", cacheable=True)
+    def ident(x):
+        calls.append(x)
+        return x
+
+    ident(1)
+    ident(2)
+    ident(1)  # hit; 2 is now the oldest entry
+    ident(3)  # evicts 2
+    ident(1)
+    ident(2)
+    assert calls == [1, 2, 3, 2]
+    assert len(TOOL_CACHE) == 2
+
+
+def test_timed_tool_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(timing.time, "monotonic", lambda: now[0])
+    calls = []
+
+    @timed_tool("ident", cacheable=True, ttl=5.0)
+    def ident(x):
+        calls.append(x)
+        return x
+
+    ident(1)
+    now[0] += 4.0
+    ident(1)
+    now[0] += 1.0  # entry is now 5 s old
+    ident(1)
+    assert calls == [1, 1]
+
+
+def test_timed_tool_async_times_the_await_and_caches_the_result():
+    sink = _Agg()
+
+    @timed_tool("slow", sink=sink, cacheable=True)
+    async def slow(x):
+        await asyncio.sleep(0.02)
+        return x + 1
+
+    async def _twice():
+        return await slow(1), await slow(1)
+
+    first, second = asyncio.run(_twice())
+    # the awaited value comes back on a hit, not a spent coroutine
+    assert (first, second) == (2, 2)
+    ((name, ms, ok),) = sink.records
+    assert name == "slow" and ok
+    assert ms >= 15.0  # the 20 ms sleep was inside the timed region
+    assert sink.cache_hits == {"slow": 1}
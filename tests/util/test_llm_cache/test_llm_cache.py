@@ -0,0 +1,79 @@
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration
+
+from ursa.util.llm_cache import SemanticCache
+
+LLM = "fake-model"
+
+
+class FakeEmbedding:
+    """Maps known message texts to fixed vectors and counts embed calls."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.seen = []
+
+    def embed_query(self, text):
+        self.seen.append(text)
+        return self.vectors[text]
+
+
+def _prompt(text: str) -> str:
+    # the shape BaseChatModel hands to the cache: serialized message list
+    return dumps([HumanMessage(content=text)])
+
+
+def _answer(text: str) -> list:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_semantic_hit_above_threshold():
+    emb = FakeEmbedding({
+        "capital of France?": [1.0, 0.0],
+        "France capital?": [0.99, 0.1],
+    })
+    cache = SemanticCache(embedding=emb, threshold=0.95)
+
+    assert cache.lookup(_prompt("capital of France?"), LLM) is None
+    cache.update(_prompt("capital of France?"), LLM, _answer("Paris"))
+
+    (gen,) = cache.lookup(_prompt("France capital?"), LLM)
+    assert gen.message.content == "Paris"
+    assert gen.message.response_metadata["cache_hit"] is True
+    assert (cache.hits, cache.misses) == (1, 1)
+    # embeddings see the message text, not the serialized JSON
+    assert emb.seen[0] == "capital of France?"
+
+
+def test_semantic_miss_below_threshold_or_other_model():
+    emb = FakeEmbedding({"a": [1.0, 0.0], "b": [0.6, 0.8]})
+    cache = SemanticCache(embedding=emb, threshold=0.95)
+    cache.lookup(_prompt("a"), LLM)
+    cache.update(_prompt("a"), LLM, _answer("A"))
+
+    assert cache.lookup(_prompt("b"), LLM) is None  # cosine 0.6
+    assert cache.lookup(_prompt("a"), "other-model") is None
+
+
+def test_missed_prompt_is_embedded_once():
+    emb = FakeEmbedding({"q": [0.0, 2.0]})
+    cache = SemanticCache(embedding=emb)
+
+    assert cache.lookup(_prompt("q"), LLM) is None
+    cache.update(_prompt("q"), LLM, _answer("x"))
+    assert emb.seen == ["q"]  # update() reused the miss's vector
+
+    # the exact key hits without embedding again
+    assert cache.lookup(_prompt("q"), LLM)[0].message.content == "x"
+    assert emb.seen == ["q"]
+
+
+def test_zero_norm_embedding_only_matches_exactly():
+    emb = FakeEmbedding({"empty": [0.0, 0.0], "other": [0.0, 0.0]})
+    cache = SemanticCache(embedding=emb)
+    cache.lookup(_prompt("empty"), LLM)
+    cache.update(_prompt("empty"), LLM, _answer("e"))
+
+    assert cache.lookup(_prompt("other"), LLM) is None
+    assert cache.lookup(_prompt("empty"), LLM)[0].message.content == "e"